@@ -6,18 +6,35 @@ Queries DigitalOcean Spaces to verify backup status and recency.
 
 import os
 import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rollup order, least to most severe
+STATUS_SEVERITY = {
+    'success': 0,
+    'warning': 1,
+    'unknown': 2,
+    'failed': 3
+}
+
 
 class BackupChecker:
     """Client for checking backup status in DigitalOcean Spaces."""
     
-    def __init__(self, endpoint: str, access_key: str, secret_key: str, bucket: str):
+    def __init__(
+        self,
+        endpoint: str,
+        access_key: str,
+        secret_key: str,
+        bucket: str,
+        max_pool_connections: int = 10
+    ):
         """
         Initialize Backup Checker.
         
@@ -26,6 +43,7 @@ class BackupChecker:
             access_key: Spaces access key
             secret_key: Spaces secret key
             bucket: Bucket name where backups are stored
+            max_pool_connections: HTTP connection pool size, shared by parallel checks
         """
         self.bucket = bucket
         self.s3_client = boto3.client(
@@ -33,7 +51,8 @@ class BackupChecker:
             endpoint_url=f'https://{endpoint}',
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
-            region_name='us-east-1'  # Required but not used by Spaces
+            region_name='us-east-1',  # Required but not used by Spaces
+            config=Config(max_pool_connections=max_pool_connections)
         )
         logger.info(f"Initialized BackupChecker for bucket: {bucket}")
     
@@ -184,6 +203,127 @@ class BackupChecker:
                 'message': f'Error checking backups: {str(e)}'
             }
     
+    def list_database_prefixes(self, prefix: str = 'backups/') -> List[str]:
+        """
+        Discover per-database sub-prefixes (e.g. backups/<db>/) under a prefix.
+        
+        Args:
+            prefix: Parent prefix containing one folder per database
+            
+        Returns:
+            List of sub-prefixes, each ending with '/'
+        """
+        if prefix and not prefix.endswith('/'):
+            prefix += '/'
+        
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            prefixes = []
+            
+            # Delimiter listings return folder names only, not every object
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter='/'):
+                prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+            
+            logger.info(f"Found {len(prefixes)} database prefixes under {self.bucket}/{prefix}")
+            return prefixes
+            
+        except Exception as e:
+            logger.error(f"Failed to list database prefixes: {e}")
+            raise
+    
+    def check_all_backup_status(
+        self,
+        prefix: str = 'backups/',
+        max_age_hours: int = 25,
+        max_workers: int = 8
+    ) -> Dict[str, any]:
+        """
+        Check backup status for every database under a prefix in parallel.
+        
+        Args:
+            prefix: Parent prefix containing one folder per database
+            max_age_hours: Maximum acceptable backup age in hours
+            max_workers: Number of databases checked concurrently
+            
+        Returns:
+            Worst-case rollup in the same shape as check_backup_status, plus
+            'databases': mapping of database name to its own status dictionary
+        """
+        try:
+            db_prefixes = self.list_database_prefixes(prefix)
+        except Exception as e:
+            return {
+                'status': 'unknown',
+                'last_backup_time': None,
+                'age_hours': None,
+                'size_bytes': None,
+                'message': f'Error listing databases: {str(e)}',
+                'databases': {}
+            }
+        
+        if not db_prefixes:
+            logger.warning("No database prefixes found")
+            return {
+                'status': 'failed',
+                'last_backup_time': None,
+                'age_hours': None,
+                'size_bytes': None,
+                'message': 'No database backups found',
+                'databases': {}
+            }
+        
+        # boto3 clients are thread-safe, so all workers share self.s3_client
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda p: self.check_backup_status(p, max_age_hours),
+                db_prefixes
+            )
+            databases = {
+                p.rstrip('/').rsplit('/', 1)[-1]: result
+                for p, result in zip(db_prefixes, results)
+            }
+        
+        rollup = self.rollup_backup_status(databases)
+        rollup['databases'] = databases
+        return rollup
+    
+    def rollup_backup_status(self, databases: Dict[str, Dict]) -> Dict[str, any]:
+        """
+        Reduce per-database results to the single worst-case status.
+        
+        Args:
+            databases: Mapping of database name to check_backup_status result
+            
+        Returns:
+            The worst database's status dictionary, with a summary message.
+            Ties are broken by the oldest backup.
+        """
+        def sort_key(item):
+            _, result = item
+            # No backup at all (age None) ranks as older than any real backup
+            return (
+                STATUS_SEVERITY.get(result['status'], STATUS_SEVERITY['unknown']),
+                result['age_hours'] if result['age_hours'] is not None else float('inf')
+            )
+        
+        worst_name, worst = max(databases.items(), key=sort_key)
+        unhealthy = sorted(name for name, r in databases.items() if r['status'] != 'success')
+        
+        if unhealthy:
+            message = f"{len(unhealthy)}/{len(databases)} databases not fresh: {', '.join(unhealthy)}"
+        else:
+            message = f"All {len(databases)} databases have recent backups"
+        
+        logger.info(f"Backup rollup: {worst['status']} (worst: {worst_name}) - {message}")
+        
+        return {
+            'status': worst['status'],
+            'last_backup_time': worst['last_backup_time'],
+            'age_hours': worst['age_hours'],
+            'size_bytes': worst['size_bytes'],
+            'message': message
+        }
+    
     def verify_backup_integrity(self, backup_key: str) -> bool:
         """
         Verify backup file exists and is accessible.
@@ -226,7 +366,12 @@ def main():
     # Check backup status
     print("\n=== Testing Backup Checker ===\n")
     
-    status = checker.check_backup_status(prefix, max_age)
+    if os.getenv('BACKUP_PER_DATABASE', 'false').lower() == 'true':
+        status = checker.check_all_backup_status(prefix, max_age)
+        for name, db_status in status['databases'].items():
+            print(f"  {name}: {db_status['status']} ({db_status['message']})")
+    else:
+        status = checker.check_backup_status(prefix, max_age)
     
     print(f"Status: {status['status']}")
     print(f"Last Backup: {status['last_backup_time']}")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Cycle Profiler
+Wraps status collection cycles in cProfile and tracemalloc and writes a report.
+"""
+
+import io
+import os
+import sys
+import linecache
+import time
+import threading
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import logging
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Enough stack depth to walk from stdlib allocation sites back to our code
+TRACEMALLOC_FRAMES = 25
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class CycleProfiler:
+    """
+    Profiles every Nth status cycle for CPU hotspots and allocation sites.
+    
+    Cycles that aren't sampled only pay for a counter increment, so the
+    profiler can stay enabled in daemon mode with a large sample interval.
+    
+    Threads started during a sampled cycle (e.g. the per-database backup
+    check workers) are profiled too and merged into the same report.
+    """
+    
+    def __init__(self, report_file: str, every: int = 1, top: int = 25):
+        """
+        Initialize cycle profiler.
+        
+        Args:
+            report_file: Path of the text report (raw pstats go to <report_file>.prof)
+            every: Profile one cycle out of every N
+            top: Number of functions and allocation sites to include
+        """
+        if every < 1:
+            raise ValueError(f"Profile interval must be >= 1, got {every}")
+        
+        self.report_file = Path(report_file)
+        self.every = every
+        self.top = top
+        self.cycle = 0
+    
+    @contextmanager
+    def profile(self):
+        """
+        Profile the wrapped block if this cycle is sampled.
+        
+        Yields:
+            None
+        """
+        self.cycle += 1
+        if (self.cycle - 1) % self.every != 0:
+            yield
+            return
+        
+        # Don't stop tracing afterwards if someone else started it
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        elif hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.take_snapshot()
+        
+        # Before 3.12 cProfile only sees the enabling thread, so give each
+        # new thread its own profiler; 3.12+ profiles all threads already
+        worker_profilers = []
+        installed_hook = sys.version_info < (3, 12)
+        if installed_hook:
+            # Restore whatever hook was set before us (getprofile is 3.10+)
+            previous_hook = threading.getprofile() if hasattr(threading, 'getprofile') else None
+            threading.setprofile(self._thread_profile_hook(worker_profilers))
+        
+        profiler = cProfile.Profile()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            if installed_hook:
+                threading.setprofile(previous_hook)
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+            for worker in worker_profilers:
+                stats.add(worker)
+            
+            self.write_report(stats, len(worker_profilers), baseline, snapshot, wall_time, cpu_time, peak)
+    
+    @staticmethod
+    def _thread_profile_hook(profilers: list):
+        """
+        Build a threading.setprofile hook that profiles each new thread.
+        
+        Args:
+            profilers: List that collects one cProfile.Profile per thread
+            
+        Returns:
+            Profile function for threading.setprofile
+        """
+        def start_thread_profiler(frame, event, arg):
+            # Runs on the thread's first event; enable() replaces this hook
+            worker = cProfile.Profile()
+            worker.enable()
+            profilers.append(worker)
+        
+        return start_thread_profiler
+    
+    @staticmethod
+    def project_allocations(diff: list) -> list:
+        """
+        Group traceback allocation diffs by the project line that caused them.
+        
+        Args:
+            diff: StatisticDiff list from Snapshot.compare_to(..., 'traceback')
+            
+        Returns:
+            List of ((filename, lineno), (size_diff, count_diff)), largest first
+        """
+        in_project = {}
+        totals = {}
+        
+        for stat in diff:
+            # Frames run oldest to newest; take the newest one in our code
+            for frame in reversed(stat.traceback):
+                if frame.filename not in in_project:
+                    path = os.path.abspath(frame.filename)
+                    in_project[frame.filename] = (
+                        os.path.dirname(path) == PROJECT_DIR
+                        and path != os.path.abspath(__file__)
+                    )
+                if in_project[frame.filename]:
+                    size, count = totals.get((frame.filename, frame.lineno), (0, 0))
+                    totals[(frame.filename, frame.lineno)] = (
+                        size + stat.size_diff,
+                        count + stat.count_diff
+                    )
+                    break
+        
+        return sorted(totals.items(), key=lambda item: abs(item[1][0]), reverse=True)
+    
+    def write_report(
+        self,
+        stats: pstats.Stats,
+        worker_threads: int,
+        baseline: tracemalloc.Snapshot,
+        snapshot: tracemalloc.Snapshot,
+        wall_time: float,
+        cpu_time: float,
+        peak_bytes: int
+    ) -> None:
+        """
+        Write the hotspot and allocation report for one cycle.
+        
+        Args:
+            stats: Merged profile stats for the calling and worker threads
+            worker_threads: Number of worker threads merged into stats
+            baseline: tracemalloc snapshot taken at the start of the cycle
+            snapshot: tracemalloc snapshot taken at the end of the cycle
+            wall_time: Cycle wall-clock time in seconds
+            cpu_time: Cycle process CPU time in seconds
+            peak_bytes: Peak traced memory during the cycle
+        """
+        out = io.StringIO()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        
+        out.write(f"=== Status cycle profile (cycle {self.cycle}, {timestamp}) ===\n")
+        out.write(f"Wall time: {wall_time:.3f}s  CPU time: {cpu_time:.3f}s  "
+                  f"Waiting (network/IO): ~{max(wall_time - cpu_time, 0.0):.3f}s\n")
+        out.write(f"Peak traced memory: {peak_bytes / 1024:.1f} KiB\n")
+        if worker_threads:
+            out.write(f"Worker threads merged: {worker_threads}\n")
+        
+        try:
+            # Raw stats keep full paths; the text report strips them below
+            self.report_file.parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(f"{self.report_file}.prof")
+        except OSError as e:
+            logger.error(f"Failed to write raw profile stats: {e}")
+        
+        # Wall-clock sorting surfaces network waits (socket reads) as hotspots
+        stats.stream = out
+        for sort_key, title in (('cumulative', 'cumulative time'), ('tottime', 'internal time')):
+            out.write(f"\n--- Top {self.top} functions by {title} ---\n")
+            stats.strip_dirs().sort_stats(sort_key).print_stats(self.top)
+        
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, __file__),
+        ]
+        out.write(f"\n--- Top {self.top} allocation sites, net change during cycle ---\n")
+        out.write("(Temporaries freed before the cycle ended only show up in the peak above)\n")
+        diff = snapshot.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), 'lineno')
+        for stat in diff[:self.top]:
+            out.write(f"{stat}\n")
+        
+        out.write(f"\n--- Top {self.top} project lines by net allocation change ---\n")
+        out.write("(Allocations attributed to the innermost frame under scripts/cli)\n")
+        for (filename, lineno), (size_diff, count_diff) in self.project_allocations(
+            snapshot.compare_to(baseline, 'traceback')
+        )[:self.top]:
+            source = linecache.getline(filename, lineno).strip()
+            out.write(f"{os.path.basename(filename)}:{lineno}: size={size_diff / 1024:+.1f} KiB, "
+                      f"count={count_diff:+d}  {source}\n")
+        
+        try:
+            self.report_file.write_text(out.getvalue())
+            logger.info(f"Wrote profile for cycle {self.cycle} to {self.report_file}")
+        except OSError as e:
+            logger.error(f"Failed to write profile report {self.report_file}: {e}")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Adaptive Poll Scheduler
+Decides how often each collector runs based on platform state and change rate.
+"""
+
+import time
+from typing import Dict, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PollPolicy:
+    """Polling bounds for a single data source."""
+    
+    def __init__(self, min_interval: float, max_interval: float, backoff: float = 2.0):
+        """
+        Initialize poll policy.
+        
+        Args:
+            min_interval: Fast cadence in seconds (used during incidents/changes)
+            max_interval: Slow cadence ceiling in seconds (used while all green)
+            backoff: Multiplier applied to the interval after each calm poll
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(
+                f"Invalid poll bounds: min={min_interval}s, max={max_interval}s"
+            )
+        if backoff < 1.0:
+            raise ValueError(f"Backoff must be >= 1.0, got {backoff}")
+        
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.backoff = float(backoff)
+
+
+class AdaptiveScheduler:
+    """
+    Schedules collectors with a fast cadence during incidents and an
+    exponentially relaxing cadence while the platform stays healthy.
+    
+    The platform is "calm" when every monitor is UP (platform_status is
+    "operational") and backups are fresh ("success"). While calm, each
+    source's interval is multiplied by its backoff until it reaches the
+    ceiling. Any non-calm state, or a change in any source's last result
+    (including recovery from an incident), resets every source to its floor.
+    """
+    
+    CALM_PLATFORM_STATUS = 'operational'
+    CALM_BACKUP_STATUS = 'success'
+    
+    def __init__(self, policies: Dict[str, PollPolicy], clock=time.monotonic):
+        """
+        Initialize scheduler.
+        
+        Args:
+            policies: Mapping of source name (e.g. "kuma", "backups") to its PollPolicy
+            clock: Monotonic time function (overridable for testing)
+        """
+        self.policies = policies
+        self.clock = clock
+        self.intervals = {name: p.min_interval for name, p in policies.items()}
+        self.last_results: Dict[str, Optional[str]] = {name: None for name in policies}
+        # Every source is due immediately on the first cycle
+        now = self.clock()
+        self.next_run = {name: now for name in policies}
+    
+    def due_sources(self) -> list:
+        """
+        List sources whose next poll time has passed.
+        
+        Returns:
+            List of source names that should be polled now
+        """
+        now = self.clock()
+        return [name for name, at in self.next_run.items() if at <= now]
+    
+    def seconds_until_next(self) -> float:
+        """
+        Time to sleep before the next source becomes due.
+        
+        Returns:
+            Seconds until the earliest scheduled poll (never negative)
+        """
+        return max(0.0, min(self.next_run.values()) - self.clock())
+    
+    def is_calm(self, platform_status: str, backup_status: str) -> bool:
+        """
+        Check whether the platform is in its healthy steady state.
+        
+        Args:
+            platform_status: Current platform_status value
+            backup_status: Current last_backup_status value
+        
+        Returns:
+            True if all monitors are UP and backups are fresh
+        """
+        return (
+            platform_status == self.CALM_PLATFORM_STATUS
+            and backup_status == self.CALM_BACKUP_STATUS
+        )
+    
+    def has_changed(self, source: str, result: str) -> bool:
+        """
+        Check whether a source's result differs from its previous poll.
+        
+        Args:
+            source: Source name that was just polled
+            result: Status value the source produced
+        
+        Returns:
+            True if the source was polled before and its result changed
+        """
+        previous = self.last_results[source]
+        return previous is not None and previous != result
+    
+    def record(self, source: str, result: str, calm: bool) -> float:
+        """
+        Record a poll result and schedule the source's next run.
+        
+        Args:
+            source: Source name that was just polled
+            result: Status value the source produced (used to detect changes)
+            calm: Whether the overall platform is currently calm
+        
+        Returns:
+            Interval in seconds until this source runs again
+        """
+        policy = self.policies[source]
+        changed = self.has_changed(source, result)
+        
+        if not calm or changed:
+            interval = policy.min_interval
+        else:
+            interval = min(self.intervals[source] * policy.backoff, policy.max_interval)
+        
+        if interval != self.intervals[source]:
+            reason = 'state changed' if changed else ('incident' if not calm else 'calm')
+            logger.info(f"Poll interval for {source}: {interval:.0f}s ({reason})")
+        
+        self.intervals[source] = interval
+        self.last_results[source] = result
+        self.next_run[source] = self.clock() + interval
+        return interval
+    
+    def escalate(self) -> None:
+        """
+        Pull every source forward to its floor cadence.
+        
+        Called when one source detects an incident or a state change, so
+        the other sources don't stay on a relaxed schedule meanwhile.
+        """
+        now = self.clock()
+        relaxed = [
+            name for name, policy in self.policies.items()
+            if self.intervals[name] > policy.min_interval
+        ]
+        if relaxed:
+            logger.warning(f"Incident or state change, switching to fast polling for: {', '.join(relaxed)}")
+        
+        for name, policy in self.policies.items():
+            self.intervals[name] = policy.min_interval
+            self.next_run[name] = min(self.next_run[name], now + policy.min_interval)
@@ -6,14 +6,21 @@ Main script that orchestrates data collection and generates status.json.
 
 import os
 import json
+import time
+import argparse
+import subprocess
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Optional
 import logging
 from pathlib import Path
 
 # Import our custom modules
 from uptime_kuma_client import UptimeKumaClient
+from uptime_counters import UptimeCounters
 from backup_checker import BackupChecker
+from scheduler import AdaptiveScheduler, PollPolicy
+from profiling import CycleProfiler
 
 logging.basicConfig(
     level=logging.INFO,
@@ -43,6 +50,8 @@ def load_env_config() -> Dict[str, str]:
         'uptime_kuma_url': os.getenv('UPTIME_KUMA_URL'),
         'uptime_kuma_api_key': os.getenv('UPTIME_KUMA_API_KEY'),
         'monitor_ids': os.getenv('MONITOR_IDS', ''),  # Comma-separated list
+        'uptime_kuma_backend': os.getenv('UPTIME_KUMA_BACKEND', 'rest'),  # rest | metrics
+        'uptime_state_file': os.getenv('UPTIME_STATE_FILE', '/tmp/uptime_counters.json'),
         
         # DigitalOcean Spaces (Backups)
         'spaces_endpoint': os.getenv('SPACES_ENDPOINT'),
@@ -51,9 +60,17 @@ def load_env_config() -> Dict[str, str]:
         'backup_bucket': os.getenv('BACKUP_BUCKET'),
         'backup_prefix': os.getenv('BACKUP_PREFIX', 'backups/'),
         'backup_max_age_hours': int(os.getenv('BACKUP_MAX_AGE_HOURS', '25')),
+        'backup_per_database': os.getenv('BACKUP_PER_DATABASE', 'false').lower() == 'true',
+        'backup_max_workers': int(os.getenv('BACKUP_MAX_WORKERS', '8')),
         
         # Output
         'output_file': os.getenv('OUTPUT_FILE', '/tmp/status.json'),
+        
+        # Daemon mode polling bounds (seconds)
+        'kuma_poll_min_seconds': int(os.getenv('KUMA_POLL_MIN_SECONDS', '60')),
+        'kuma_poll_max_seconds': int(os.getenv('KUMA_POLL_MAX_SECONDS', '600')),
+        'backup_poll_min_seconds': int(os.getenv('BACKUP_POLL_MIN_SECONDS', '300')),
+        'backup_poll_max_seconds': int(os.getenv('BACKUP_POLL_MAX_SECONDS', '3600')),
     }
     
     return config
@@ -79,17 +96,14 @@ def parse_monitor_ids(monitor_ids_str: str) -> list:
         return []
 
 
-def generate_status_json(config: Dict[str, str]) -> Dict:
+def new_status_data() -> Dict:
     """
-    Generate the complete status.json data structure.
+    Build an empty status structure with default (unknown) values.
     
-    Args:
-        config: Configuration dictionary
-        
     Returns:
         Dictionary matching the frontend schema
     """
-    status_data = {
+    return {
         'updated_at': datetime.now(timezone.utc).isoformat(),
         'platform_status': 'unknown',
         'uptime': {
@@ -102,6 +116,144 @@ def generate_status_json(config: Dict[str, str]) -> Dict:
             'last_backup_time': None
         }
     }
+
+
+def build_kuma_client(config: Dict[str, str]) -> Optional[UptimeKumaClient]:
+    """
+    Create an Uptime Kuma client if credentials are configured.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        UptimeKumaClient instance, or None if not configured
+    """
+    if not config['uptime_kuma_url'] or not config['uptime_kuma_api_key']:
+        logger.warning("Uptime Kuma credentials not configured")
+        return None
+    
+    counters = None
+    if config['uptime_kuma_backend'] == 'metrics':
+        # Uptime is accumulated from /metrics samples across runs
+        counters = UptimeCounters(config['uptime_state_file'])
+    
+    return UptimeKumaClient(
+        config['uptime_kuma_url'],
+        config['uptime_kuma_api_key'],
+        backend=config['uptime_kuma_backend'],
+        counters=counters
+    )
+
+
+def build_backup_checker(config: Dict[str, str]) -> Optional[BackupChecker]:
+    """
+    Create a backup checker if Spaces credentials are configured.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        BackupChecker instance, or None if not configured
+    """
+    if not all([
+        config['spaces_endpoint'],
+        config['spaces_access_key'],
+        config['spaces_secret_key'],
+        config['backup_bucket']
+    ]):
+        logger.warning("Backup checker credentials not configured")
+        return None
+    
+    return BackupChecker(
+        config['spaces_endpoint'],
+        config['spaces_access_key'],
+        config['spaces_secret_key'],
+        config['backup_bucket'],
+        max_pool_connections=config['backup_max_workers']
+    )
+
+
+def collect_kuma_status(kuma_client: UptimeKumaClient, status_data: Dict, monitor_ids: list) -> None:
+    """
+    Fetch platform status and uptime from Uptime Kuma into status_data.
+    
+    Args:
+        kuma_client: Configured Uptime Kuma client
+        status_data: Status dictionary to update in place
+        monitor_ids: Monitor IDs to include (empty list for all)
+    """
+    try:
+        logger.info("Fetching Uptime Kuma data...")
+        
+        # Get platform status and uptime metrics
+        platform_status, uptime_data = kuma_client.get_status_snapshot(
+            monitor_ids if monitor_ids else None
+        )
+        status_data['platform_status'] = platform_status
+        status_data['uptime'] = uptime_data
+        
+        logger.info(f"✅ Platform status: {platform_status}")
+        
+    except Exception as e:
+        logger.error(f"❌ Failed to fetch Uptime Kuma data: {e}")
+        # Don't keep publishing the last good values; unknown also makes
+        # the daemon scheduler treat the failed poll as not calm
+        defaults = new_status_data()
+        status_data['platform_status'] = defaults['platform_status']
+        status_data['uptime'] = defaults['uptime']
+
+
+def collect_backup_status(backup_checker: BackupChecker, status_data: Dict, config: Dict[str, str]) -> None:
+    """
+    Check backup freshness in Spaces into status_data.
+    
+    Args:
+        backup_checker: Configured backup checker
+        status_data: Status dictionary to update in place
+        config: Configuration dictionary
+    """
+    try:
+        logger.info("Checking backup status...")
+        
+        if config['backup_per_database']:
+            # One LIST discovers backups/<db>/ folders, then each is checked in parallel
+            backup_status = backup_checker.check_all_backup_status(
+                prefix=config['backup_prefix'],
+                max_age_hours=config['backup_max_age_hours'],
+                max_workers=config['backup_max_workers']
+            )
+            
+            # Per-database detail stays in the logs; status.json is public
+            for db_name, db_status in backup_status['databases'].items():
+                logger.info(f"  {db_name}: {db_status['status']} - {db_status['message']}")
+        else:
+            backup_status = backup_checker.check_backup_status(
+                prefix=config['backup_prefix'],
+                max_age_hours=config['backup_max_age_hours']
+            )
+        
+        status_data['backups']['last_backup_status'] = backup_status['status']
+        status_data['backups']['last_backup_time'] = backup_status['last_backup_time']
+        
+        logger.info(f"✅ Backup status: {backup_status['status']}")
+        
+    except Exception as e:
+        logger.error(f"❌ Failed to check backup status: {e}")
+        # Reset to unknown rather than publishing stale results
+        status_data['backups'] = new_status_data()['backups']
+
+
+def generate_status_json(config: Dict[str, str]) -> Dict:
+    """
+    Generate the complete status.json data structure.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        Dictionary matching the frontend schema
+    """
+    status_data = new_status_data()
     
     # Parse monitor IDs
     monitor_ids = parse_monitor_ids(config['monitor_ids'])
@@ -112,66 +264,19 @@ def generate_status_json(config: Dict[str, str]) -> Dict:
     
     # === Fetch Uptime Kuma Data ===
     try:
-        if not config['uptime_kuma_url'] or not config['uptime_kuma_api_key']:
-            logger.warning("Uptime Kuma credentials not configured")
-        else:
-            logger.info("Fetching Uptime Kuma data...")
-            
-            kuma_client = UptimeKumaClient(
-                config['uptime_kuma_url'],
-                config['uptime_kuma_api_key']
-            )
-            
-            # Get platform status
-            platform_status = kuma_client.get_platform_status(
-                monitor_ids if monitor_ids else None
-            )
-            status_data['platform_status'] = platform_status
-            
-            # Get uptime metrics
-            uptime_data = kuma_client.get_aggregated_uptime(
-                monitor_ids if monitor_ids else None
-            )
-            status_data['uptime'] = uptime_data
-            
-            logger.info(f"✅ Platform status: {platform_status}")
-            
+        kuma_client = build_kuma_client(config)
+        if kuma_client:
+            collect_kuma_status(kuma_client, status_data, monitor_ids)
     except Exception as e:
         logger.error(f"❌ Failed to fetch Uptime Kuma data: {e}")
-        # Keep default values (unknown, 0.0)
     
     # === Check Backup Status ===
     try:
-        if not all([
-            config['spaces_endpoint'],
-            config['spaces_access_key'],
-            config['spaces_secret_key'],
-            config['backup_bucket']
-        ]):
-            logger.warning("Backup checker credentials not configured")
-        else:
-            logger.info("Checking backup status...")
-            
-            backup_checker = BackupChecker(
-                config['spaces_endpoint'],
-                config['spaces_access_key'],
-                config['spaces_secret_key'],
-                config['backup_bucket']
-            )
-            
-            backup_status = backup_checker.check_backup_status(
-                prefix=config['backup_prefix'],
-                max_age_hours=config['backup_max_age_hours']
-            )
-            
-            status_data['backups']['last_backup_status'] = backup_status['status']
-            status_data['backups']['last_backup_time'] = backup_status['last_backup_time']
-            
-            logger.info(f"✅ Backup status: {backup_status['status']}")
-            
+        backup_checker = build_backup_checker(config)
+        if backup_checker:
+            collect_backup_status(backup_checker, status_data, config)
     except Exception as e:
         logger.error(f"❌ Failed to check backup status: {e}")
-        # Keep default values (unknown, None)
     
     return status_data
 
@@ -198,16 +303,219 @@ def save_status_json(data: Dict, output_file: str) -> None:
         raise
 
 
-def main():
+def upload_status_json() -> bool:
+    """
+    Upload the generated status.json using the upload shell script.
+    
+    Returns:
+        True if the upload script succeeded, False otherwise
+    """
+    upload_script = Path(__file__).parent.parent / 'upload_status_json.sh'
+    result = subprocess.run([str(upload_script)], capture_output=True, text=True)
+    
+    if result.returncode != 0:
+        logger.error(f"❌ Upload failed with exit code {result.returncode}: {result.stdout}{result.stderr}")
+        return False
+    
+    logger.info("✅ Uploaded status.json")
+    return True
+
+
+def build_scheduler(config: Dict[str, str], sources: list) -> AdaptiveScheduler:
+    """
+    Create the adaptive scheduler for the configured data sources.
+    
+    Args:
+        config: Configuration dictionary
+        sources: Source names to schedule ("kuma" and/or "backups")
+        
+    Returns:
+        AdaptiveScheduler with one policy per source
+    """
+    policies = {
+        'kuma': PollPolicy(
+            config['kuma_poll_min_seconds'],
+            config['kuma_poll_max_seconds']
+        ),
+        'backups': PollPolicy(
+            config['backup_poll_min_seconds'],
+            config['backup_poll_max_seconds']
+        ),
+    }
+    return AdaptiveScheduler({name: policies[name] for name in sources})
+
+
+def run_cycle(
+    scheduler: AdaptiveScheduler,
+    clients: Dict[str, object],
+    status_data: Dict,
+    config: Dict[str, str],
+    monitor_ids: list
+) -> list:
+    """
+    Poll every due source once and reschedule it.
+    
+    Args:
+        scheduler: Adaptive scheduler tracking per-source cadence
+        clients: Mapping of source name to its configured client
+        status_data: Status dictionary to update in place
+        config: Configuration dictionary
+        monitor_ids: Monitor IDs to include (empty list for all)
+        
+    Returns:
+        List of source names that were polled this cycle
+    """
+    due = scheduler.due_sources()
+    
+    for source in due:
+        if source == 'kuma':
+            collect_kuma_status(clients['kuma'], status_data, monitor_ids)
+        elif source == 'backups':
+            collect_backup_status(clients['backups'], status_data, config)
+    
+    if not due:
+        return due
+    
+    status_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    
+    # Unconfigured sources don't count against the calm state
+    calm = scheduler.is_calm(
+        status_data['platform_status'] if 'kuma' in clients else scheduler.CALM_PLATFORM_STATUS,
+        status_data['backups']['last_backup_status'] if 'backups' in clients else scheduler.CALM_BACKUP_STATUS
+    )
+    
+    results = {
+        'kuma': status_data['platform_status'],
+        'backups': status_data['backups']['last_backup_status'],
+    }
+    
+    # A change in any source (e.g. recovery) also pulls every source to its floor
+    changed = any(scheduler.has_changed(source, results[source]) for source in due)
+    steady = calm and not changed
+    if not steady:
+        scheduler.escalate()
+    
+    for source in due:
+        scheduler.record(source, results[source], steady)
+    
+    return due
+
+
+def run_daemon(
+    config: Dict[str, str],
+    upload: bool = False,
+    profiler: Optional[CycleProfiler] = None
+) -> int:
+    """
+    Run the status generator continuously with adaptive polling.
+    
+    Args:
+        config: Configuration dictionary
+        upload: Whether to upload status.json after each cycle
+        profiler: Optional profiler sampling every Nth cycle
+        
+    Returns:
+        Process exit code
+    """
+    monitor_ids = parse_monitor_ids(config['monitor_ids'])
+    
+    # Clients are built once so HTTP sessions and S3 connections are reused
+    clients = {}
+    kuma_client = build_kuma_client(config)
+    if kuma_client:
+        clients['kuma'] = kuma_client
+    backup_checker = build_backup_checker(config)
+    if backup_checker:
+        clients['backups'] = backup_checker
+    
+    if not clients:
+        logger.error("❌ No data sources configured, nothing to poll")
+        return 1
+    
+    scheduler = build_scheduler(config, list(clients))
+    status_data = new_status_data()
+    
+    logger.info(f"Starting daemon for sources: {', '.join(clients)}")
+    
+    try:
+        while True:
+            with profiler.profile() if profiler else nullcontext():
+                polled = run_cycle(scheduler, clients, status_data, config, monitor_ids)
+            
+            if polled:
+                try:
+                    save_status_json(status_data, config['output_file'])
+                    if upload:
+                        upload_status_json()
+                except Exception as e:
+                    # Keep polling; the next cycle will retry the write
+                    logger.error(f"❌ Failed to publish status: {e}")
+            
+            time.sleep(scheduler.seconds_until_next())
+            
+    except KeyboardInterrupt:
+        logger.info("Daemon stopped")
+        return 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Generate platform status.json')
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run continuously with adaptive polling instead of a single cycle'
+    )
+    parser.add_argument(
+        '--upload',
+        action='store_true',
+        help='In daemon mode, upload status.json to Spaces after each cycle'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='REPORT_FILE',
+        help='Profile cycles (cProfile + tracemalloc) and write a hotspot report to REPORT_FILE'
+    )
+    parser.add_argument(
+        '--profile-every',
+        type=int,
+        metavar='N',
+        help='With --profile in daemon mode, only profile every Nth cycle (default: 1)'
+    )
+    args = parser.parse_args(argv)
+    
+    if args.upload and not args.daemon:
+        parser.error('--upload requires --daemon (use generate_and_upload.sh for one-shot runs)')
+    if args.profile_every is not None:
+        if not args.profile:
+            parser.error('--profile-every requires --profile')
+        if args.profile_every < 1:
+            parser.error('--profile-every must be >= 1')
+    else:
+        args.profile_every = 1
+    
+    return args
+
+
+def main(argv=None):
     """Main execution flow."""
+    args = parse_args(argv)
     logger.info("=== Platform Status Generator ===")
     
     try:
         # Load configuration
         config = load_env_config()
         
+        profiler = None
+        if args.profile:
+            profiler = CycleProfiler(args.profile, every=args.profile_every)
+        
+        if args.daemon:
+            return run_daemon(config, upload=args.upload, profiler=profiler)
+        
         # Generate status data
-        status_data = generate_status_json(config)
+        with profiler.profile() if profiler else nullcontext():
+            status_data = generate_status_json(config)
         
         # Save to file
         save_status_json(status_data, config['output_file'])
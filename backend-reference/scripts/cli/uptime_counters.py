@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Incremental Uptime Counters
+Accumulates per-monitor up/down time from periodic status samples.
+"""
+
+import json
+import time
+from typing import Dict, List, Optional
+import logging
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Status code counted as UP (matches heartbeat status in the REST API)
+STATUS_UP = 1
+
+BUCKET_SECONDS = 3600
+RETENTION_HOURS = 24 * 30
+
+UPTIME_PERIODS = {
+    "last_24h": 24,
+    "last_7d": 24 * 7,
+    "last_30d": 24 * 30
+}
+
+
+class UptimeCounters:
+    """
+    Hourly up/total counters per monitor, persisted to a small JSON file.
+    
+    Each sample is weighted by the time elapsed since that monitor's previous
+    sample, so uptime stays accurate when the polling cadence varies (e.g.
+    the adaptive scheduler polls faster during incidents).
+    """
+    
+    def __init__(self, state_file: Optional[str] = None, max_sample_gap: float = 3600.0):
+        """
+        Initialize counters.
+        
+        Args:
+            state_file: Path to persist counters between runs (None for in-memory only)
+            max_sample_gap: Cap in seconds on the weight of a single sample, so
+                            a long collector outage isn't attributed to one status
+        """
+        self.state_file = Path(state_file) if state_file else None
+        self.max_sample_gap = max_sample_gap
+        self.monitors: Dict[str, Dict] = {}
+        self.load()
+    
+    def load(self) -> None:
+        """Load counters from the state file if it exists."""
+        if not self.state_file or not self.state_file.exists():
+            return
+        
+        try:
+            with open(self.state_file) as f:
+                self.monitors = json.load(f).get('monitors', {})
+            logger.debug(f"Loaded uptime counters for {len(self.monitors)} monitors")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load uptime counters from {self.state_file}, starting fresh: {e}")
+            self.monitors = {}
+    
+    def save(self) -> None:
+        """Persist counters to the state file (atomic replace)."""
+        if not self.state_file:
+            return
+        
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'monitors': self.monitors}, f)
+            tmp_path.replace(self.state_file)
+        except OSError as e:
+            logger.error(f"Failed to save uptime counters to {self.state_file}: {e}")
+    
+    def record(self, samples: Dict[str, Dict], now: Optional[float] = None) -> None:
+        """
+        Add one status sample per monitor.
+        
+        Args:
+            samples: Mapping of monitor key to sample dict with a 'status' code
+            now: Sample timestamp in epoch seconds (defaults to current time)
+        """
+        now = time.time() if now is None else now
+        bucket = str(int(now // BUCKET_SECONDS) * BUCKET_SECONDS)
+        
+        for key, sample in samples.items():
+            status = sample.get('status')
+            if status is None:
+                continue
+            
+            counters = self.monitors.setdefault(key, {'last_seen': None, 'buckets': {}})
+            last_seen = counters['last_seen']
+            
+            # First sample for a monitor counts as one second of observation
+            weight = 1.0 if last_seen is None else min(max(now - last_seen, 0.0), self.max_sample_gap)
+            
+            up_total = counters['buckets'].setdefault(bucket, [0.0, 0.0])
+            if status == STATUS_UP:
+                up_total[0] += weight
+            up_total[1] += weight
+            counters['last_seen'] = now
+        
+        self.prune(now)
+    
+    def prune(self, now: float) -> None:
+        """
+        Drop buckets older than the retention window.
+        
+        Args:
+            now: Current time in epoch seconds
+        """
+        cutoff = now - RETENTION_HOURS * BUCKET_SECONDS
+        for counters in self.monitors.values():
+            counters['buckets'] = {
+                bucket: values for bucket, values in counters['buckets'].items()
+                if int(bucket) >= cutoff
+            }
+    
+    def calculate_uptime(self, key: str, hours: int, now: Optional[float] = None) -> Optional[float]:
+        """
+        Calculate uptime percentage for one monitor over a window.
+        
+        Args:
+            key: Monitor key
+            hours: Window size in hours
+            now: Current time in epoch seconds (defaults to current time)
+        
+        Returns:
+            Uptime percentage (0.0 - 100.0), or None if no samples in the window
+        """
+        now = time.time() if now is None else now
+        counters = self.monitors.get(key)
+        if not counters:
+            return None
+        
+        cutoff = (int(now // BUCKET_SECONDS) - hours + 1) * BUCKET_SECONDS
+        up = total = 0.0
+        for bucket, (bucket_up, bucket_total) in counters['buckets'].items():
+            if int(bucket) >= cutoff:
+                up += bucket_up
+                total += bucket_total
+        
+        if total <= 0:
+            return None
+        
+        return round((up / total) * 100, 2)
+    
+    def get_aggregated_uptime(self, keys: List[str], now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Average uptime across monitors for each reporting period.
+        
+        Args:
+            keys: Monitor keys to include
+            now: Current time in epoch seconds (defaults to current time)
+        
+        Returns:
+            Dictionary with uptime percentages for 24h, 7d, 30d
+        """
+        uptime_data = {}
+        
+        for period_name, hours in UPTIME_PERIODS.items():
+            uptimes = [
+                uptime for uptime in (self.calculate_uptime(key, hours, now) for key in keys)
+                if uptime is not None
+            ]
+            avg_uptime = sum(uptimes) / len(uptimes) if uptimes else 0.0
+            uptime_data[period_name] = round(avg_uptime, 2)
+            
+            logger.info(f"{period_name}: {avg_uptime:.2f}%")
+        
+        return uptime_data
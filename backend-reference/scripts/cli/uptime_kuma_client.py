@@ -5,28 +5,157 @@ Fetches monitor status and calculates uptime metrics.
 """
 
 import os
+import re
+import sys
+import time
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from uptime_counters import UptimeCounters
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BACKENDS = ('rest', 'metrics')
+
+# Prometheus series we read from /metrics; everything else is skipped
+_METRIC_FIELDS = {
+    'monitor_status': 'status',
+    'monitor_response_time': 'response_time',
+}
+_METRIC_PREFIXES = tuple(f'{name}{{' for name in _METRIC_FIELDS)
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def _unescape_label(value: str) -> str:
+    """Undo Prometheus label value escaping (backslash, quote, newline)."""
+    if '\\' not in value:
+        return value
+    return _ESCAPE_RE.sub(lambda m: '\n' if m.group(1) == 'n' else m.group(1), value)
+
+
+def parse_metrics(lines: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Parse Uptime Kuma monitor series from Prometheus exposition text.
+    
+    Only `monitor_status` and `monitor_response_time` lines are decoded;
+    all other lines are rejected with a single prefix check, so the parser
+    can consume a streamed response without buffering it.
+    
+    Args:
+        lines: Iterable of exposition format lines
+        
+    Returns:
+        Mapping of monitor key to sample dict:
+        {'id': int or None, 'name': str, 'status': int or None, 'response_time': float or None}
+    """
+    samples: Dict[str, Dict] = {}
+    
+    for line in lines:
+        if not line.startswith(_METRIC_PREFIXES):
+            continue
+        
+        metric, _, rest = line.partition('{')
+        labels_str, _, value_str = rest.rpartition('}')
+        value_parts = value_str.split()
+        if not value_parts:
+            continue
+        
+        try:
+            value = float(value_parts[0])
+        except ValueError:
+            logger.debug(f"Skipping unparseable metric line: {line}")
+            continue
+        
+        labels = {k: _unescape_label(v) for k, v in _LABEL_RE.findall(labels_str)}
+        monitor_id = labels.get('monitor_id')
+        name = labels.get('monitor_name', '')
+        
+        # Newer Kuma versions label series with monitor_id; older ones only by name
+        if monitor_id and monitor_id.isdigit():
+            key = monitor_id
+            monitor_id = int(monitor_id)
+        else:
+            key = f'name:{name}'
+            monitor_id = None
+        
+        sample = samples.get(key)
+        if sample is None:
+            sample = samples[key] = {
+                'id': monitor_id,
+                'name': name,
+                'status': None,
+                'response_time': None
+            }
+        
+        if _METRIC_FIELDS[metric] == 'status':
+            sample['status'] = int(value) if value == value else None  # NaN check
+        else:
+            sample['response_time'] = value
+    
+    return samples
+
+
+def classify_statuses(statuses: List[int]) -> str:
+    """
+    Map monitor status codes to an overall platform status.
+    
+    Args:
+        statuses: Status codes (0 = DOWN, 1 = UP, 2 = PENDING, 3 = MAINTENANCE)
+        
+    Returns:
+        Platform status: "operational" | "degraded" | "outage" | "unknown"
+    """
+    # Any monitor DOWN → outage
+    if 0 in statuses:
+        logger.warning("Platform outage detected (monitor(s) down)")
+        return "outage"
+    
+    # Any monitor PENDING/MAINTENANCE → degraded
+    if 2 in statuses or 3 in statuses:
+        logger.info("Platform degraded (monitor(s) in maintenance/pending)")
+        return "degraded"
+    
+    # All monitors UP → operational
+    if statuses and all(s == 1 for s in statuses):
+        logger.info("Platform operational (all monitors up)")
+        return "operational"
+    
+    # Unknown state
+    logger.warning(f"Unknown platform state: {statuses}")
+    return "unknown"
+
 
 class UptimeKumaClient:
     """Client for interacting with Uptime Kuma API."""
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        backend: str = 'rest',
+        counters: Optional[UptimeCounters] = None
+    ):
         """
         Initialize Uptime Kuma client.
         
         Args:
             base_url: Uptime Kuma instance URL (e.g., https://uptime.yourdomain.com)
             api_key: API key for authentication
+            backend: "rest" (per-monitor API calls) or "metrics" (single /metrics scrape)
+            counters: Uptime counters fed by the metrics backend (in-memory if omitted)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown Uptime Kuma backend '{backend}', expected one of {BACKENDS}")
+        
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
+        self.backend = backend
+        self.counters = counters if counters is not None else UptimeCounters()
+        self._monitor_names: Optional[Dict[int, str]] = None
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {api_key}',
@@ -82,6 +211,88 @@ class UptimeKumaClient:
             logger.error(f"Failed to fetch heartbeats for monitor {monitor_id}: {e}")
             return []
     
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Fetch every monitor's status and response time from /metrics.
+        
+        Returns:
+            Mapping of monitor key to sample dict (see parse_metrics)
+        """
+        try:
+            # /metrics uses HTTP basic auth with the API key as the password
+            with self.session.get(
+                f'{self.base_url}/metrics',
+                auth=('', self.api_key),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                samples = parse_metrics(
+                    response.iter_lines(chunk_size=65536, decode_unicode=True)
+                )
+            
+            logger.info(f"Fetched metrics for {len(samples)} monitors")
+            return samples
+            
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch metrics: {e}")
+            raise
+    
+    def _resolve_monitor_names(self, monitor_ids: List[int]) -> Dict[int, str]:
+        """
+        Map monitor IDs to names for /metrics series without a monitor_id label.
+        
+        The ID → name map comes from one GET /api/monitor and is cached; it is
+        only refetched when a requested ID isn't in the cache yet.
+        
+        Args:
+            monitor_ids: Monitor IDs to resolve
+            
+        Returns:
+            Mapping of requested monitor ID to monitor name (unknown IDs omitted)
+            
+        Raises:
+            requests.RequestException: If the monitor list can't be fetched
+        """
+        if self._monitor_names is None or any(i not in self._monitor_names for i in monitor_ids):
+            self._monitor_names = {
+                m['id']: m.get('name', '')
+                for m in self.get_monitors()
+                if m.get('id') is not None
+            }
+        
+        missing = [i for i in monitor_ids if i not in self._monitor_names]
+        if missing:
+            logger.warning(f"Monitor IDs not found in Uptime Kuma: {missing}")
+        
+        return {i: self._monitor_names[i] for i in monitor_ids if i in self._monitor_names}
+    
+    def _filter_samples(self, samples: Dict[str, Dict], monitor_ids: Optional[List[int]]) -> Dict[str, Dict]:
+        """
+        Restrict metrics samples to the requested monitor IDs.
+        
+        Series without a monitor_id label (older Uptime Kuma) are matched by
+        monitor name instead. Filtering never falls back to all monitors, so
+        excluded monitors can't affect the published status.
+        
+        Args:
+            samples: Samples returned by get_metrics
+            monitor_ids: Optional list of monitor IDs to keep
+            
+        Returns:
+            Filtered samples
+        """
+        if not monitor_ids:
+            return samples
+        
+        names = None
+        if any(sample['id'] is None for sample in samples.values()):
+            names = set(self._resolve_monitor_names(monitor_ids).values())
+        
+        return {
+            key: sample for key, sample in samples.items()
+            if (sample['id'] in monitor_ids if sample['id'] is not None else sample['name'] in names)
+        }
+    
     def calculate_uptime(self, monitor_id: int, hours: int = 24) -> float:
         """
         Calculate uptime percentage for a monitor over specified time period.
@@ -119,6 +330,10 @@ class UptimeKumaClient:
         Returns:
             Platform status: "operational" | "degraded" | "outage" | "unknown"
         """
+        if self.backend == 'metrics':
+            # Same scrape-and-count path as get_status_snapshot
+            return self.get_status_snapshot(monitor_ids)[0]
+        
         try:
             monitors = self.get_monitors()
             
@@ -126,32 +341,14 @@ class UptimeKumaClient:
             if monitor_ids:
                 monitors = [m for m in monitors if m.get('id') in monitor_ids]
             
-            if not monitors:
-                logger.warning("No monitors found")
-                return "unknown"
-            
-            # Check monitor statuses
             # Status codes: 0 = DOWN, 1 = UP, 2 = PENDING/MAINTENANCE
             statuses = [m.get('status', 0) for m in monitors]
             
-            # Any monitor DOWN → outage
-            if 0 in statuses:
-                logger.warning("Platform outage detected (monitor(s) down)")
-                return "outage"
-            
-            # Any monitor PENDING/MAINTENANCE → degraded
-            if 2 in statuses:
-                logger.info("Platform degraded (monitor(s) in maintenance/pending)")
-                return "degraded"
-            
-            # All monitors UP → operational
-            if all(s == 1 for s in statuses):
-                logger.info("Platform operational (all monitors up)")
-                return "operational"
+            if not statuses:
+                logger.warning("No monitors found")
+                return "unknown"
             
-            # Unknown state
-            logger.warning(f"Unknown platform state: {statuses}")
-            return "unknown"
+            return classify_statuses(statuses)
             
         except Exception as e:
             logger.error(f"Failed to determine platform status: {e}")
@@ -167,6 +364,10 @@ class UptimeKumaClient:
         Returns:
             Dictionary with uptime percentages for 24h, 7d, 30d
         """
+        if self.backend == 'metrics':
+            # Same scrape-and-count path as get_status_snapshot
+            return self.get_status_snapshot(monitor_ids)[1]
+        
         try:
             monitors = self.get_monitors()
             
@@ -214,6 +415,82 @@ class UptimeKumaClient:
                 "last_7d": 0.0,
                 "last_30d": 0.0
             }
+    
+    def get_status_snapshot(self, monitor_ids: Optional[List[int]] = None) -> Tuple[str, Dict[str, float]]:
+        """
+        Fetch platform status and uptime for one collection cycle.
+        
+        With the metrics backend this is a single /metrics request: the
+        samples drive the platform status and are added to the incremental
+        uptime counters. The REST backend falls back to get_platform_status
+        and get_aggregated_uptime.
+        
+        Args:
+            monitor_ids: Optional list of monitor IDs to include
+        
+        Returns:
+            Tuple of (platform status, uptime dictionary for 24h, 7d, 30d)
+        """
+        if self.backend != 'metrics':
+            return (
+                self.get_platform_status(monitor_ids),
+                self.get_aggregated_uptime(monitor_ids)
+            )
+        
+        try:
+            samples = self._filter_samples(self.get_metrics(), monitor_ids)
+            
+            for sample in samples.values():
+                latency = sample['response_time']
+                latency_str = f"{latency:.0f} ms" if latency is not None and latency == latency else "n/a"
+                logger.info(f"Monitor {sample['name'] or sample['id']}: status {sample['status']}, response time {latency_str}")
+            
+            self.counters.record(samples)
+            self.counters.save()
+            
+            statuses = [s['status'] for s in samples.values() if s['status'] is not None]
+            platform_status = classify_statuses(statuses) if statuses else "unknown"
+            uptime_data = self.counters.get_aggregated_uptime(list(samples))
+            
+            return platform_status, uptime_data
+            
+        except Exception as e:
+            # Same contract as the REST path: never raise, report unknown
+            logger.error(f"Failed to collect metrics snapshot: {e}")
+            return "unknown", {
+                "last_24h": 0.0,
+                "last_7d": 0.0,
+                "last_30d": 0.0
+            }
+
+
+def benchmark_backends(base_url: str, api_key: str, iterations: int = 5) -> None:
+    """
+    Compare request count and wall time of the REST and metrics backends.
+    
+    Args:
+        base_url: Uptime Kuma instance URL
+        api_key: API key for authentication
+        iterations: Number of collection cycles to time per backend
+    """
+    print(f"\n=== Benchmarking Uptime Kuma backends ({iterations} cycles) ===\n")
+    
+    for backend in BACKENDS:
+        client = UptimeKumaClient(base_url, api_key, backend=backend)
+        
+        request_count = 0
+        def count_request(response, *args, **kwargs):
+            nonlocal request_count
+            request_count += 1
+        client.session.hooks['response'].append(count_request)
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.get_status_snapshot()
+        elapsed = time.perf_counter() - start
+        
+        print(f"{backend:>8}: {elapsed / iterations * 1000:8.1f} ms/cycle, "
+              f"{request_count / iterations:6.1f} requests/cycle")
 
 
 def main():
@@ -229,18 +506,24 @@ def main():
         logger.error("Missing UPTIME_KUMA_URL or UPTIME_KUMA_API_KEY environment variables")
         return
     
+    if '--benchmark' in sys.argv:
+        benchmark_backends(base_url, api_key)
+        return
+    
     # Initialize client
-    client = UptimeKumaClient(base_url, api_key)
+    client = UptimeKumaClient(
+        base_url,
+        api_key,
+        backend=os.getenv('UPTIME_KUMA_BACKEND', 'rest')
+    )
     
     # Test operations
     print("\n=== Testing Uptime Kuma Client ===\n")
     
-    # Get platform status
-    status = client.get_platform_status()
+    # Get platform status and uptime (one /metrics scrape with the metrics backend)
+    status, uptime = client.get_status_snapshot()
     print(f"Platform Status: {status}")
     
-    # Get aggregated uptime
-    uptime = client.get_aggregated_uptime()
     print(f"\nUptime Metrics:")
     print(f"  Last 24h: {uptime['last_24h']}%")
     print(f"  Last 7d:  {uptime['last_7d']}%")
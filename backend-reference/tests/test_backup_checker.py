@@ -0,0 +1,64 @@
+"""
+Tests for BackupChecker.rollup_backup_status.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('boto3')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'cli'))
+
+from backup_checker import BackupChecker  # noqa: E402
+
+
+def make_result(status, age_hours):
+    """Build a check_backup_status-shaped result."""
+    return {
+        'status': status,
+        'last_backup_time': None if age_hours is None else f'{age_hours}h-ago',
+        'age_hours': age_hours,
+        'size_bytes': None if age_hours is None else 1024,
+        'message': ''
+    }
+
+
+@pytest.fixture
+def checker():
+    # rollup_backup_status doesn't touch S3, so skip client setup
+    return BackupChecker.__new__(BackupChecker)
+
+
+def test_rollup_tie_reports_oldest_backup(checker):
+    rollup = checker.rollup_backup_status({
+        'a': make_result('success', 2.0),
+        'b': make_result('success', 20.0),
+    })
+
+    assert rollup['status'] == 'success'
+    assert rollup['age_hours'] == 20.0
+    assert rollup['last_backup_time'] == '20.0h-ago'
+
+
+def test_rollup_tie_ranks_missing_backups_worst(checker):
+    rollup = checker.rollup_backup_status({
+        'c': make_result('failed', None),
+        'd': make_result('failed', 80.0),
+    })
+
+    assert rollup['status'] == 'failed'
+    assert rollup['age_hours'] is None
+    assert rollup['last_backup_time'] is None
+
+
+def test_rollup_severity_beats_age(checker):
+    rollup = checker.rollup_backup_status({
+        'old': make_result('success', 24.0),
+        'aging': make_result('warning', 26.0),
+        'broken': make_result('unknown', None),
+    })
+
+    assert rollup['status'] == 'unknown'
+    assert rollup['message'].startswith('2/3 databases not fresh')
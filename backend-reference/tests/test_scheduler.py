@@ -0,0 +1,113 @@
+"""
+Tests for AdaptiveScheduler and PollPolicy.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'cli'))
+
+from scheduler import AdaptiveScheduler, PollPolicy  # noqa: E402
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return AdaptiveScheduler(
+        {
+            'kuma': PollPolicy(60, 600),
+            'backups': PollPolicy(300, 3600),
+        },
+        clock=clock
+    )
+
+
+def test_all_sources_due_on_first_cycle(scheduler):
+    assert scheduler.due_sources() == ['kuma', 'backups']
+    assert scheduler.seconds_until_next() == 0.0
+
+
+def test_calm_polls_back_off_to_ceiling(scheduler, clock):
+    intervals = []
+    for _ in range(6):
+        intervals.append(scheduler.record('kuma', 'operational', calm=True))
+        clock.now += intervals[-1]
+
+    assert intervals == [120.0, 240.0, 480.0, 600.0, 600.0, 600.0]
+
+
+def test_incident_resets_to_floor(scheduler):
+    scheduler.record('kuma', 'operational', calm=True)
+    scheduler.record('kuma', 'operational', calm=True)
+
+    assert scheduler.record('kuma', 'outage', calm=False) == 60.0
+
+
+def test_escalate_pulls_other_source_forward(scheduler, clock):
+    scheduler.record('backups', 'success', calm=True)
+    scheduler.record('backups', 'success', calm=True)
+    assert scheduler.next_run['backups'] == 1200.0
+
+    clock.now = 100.0
+    scheduler.escalate()
+
+    assert scheduler.intervals['backups'] == 300.0
+    assert scheduler.next_run['backups'] == 400.0
+
+
+def test_escalate_never_delays_an_earlier_poll(scheduler, clock):
+    scheduler.record('kuma', 'operational', calm=True)
+    assert scheduler.next_run['kuma'] == 120.0
+
+    clock.now = 90.0
+    scheduler.escalate()
+
+    assert scheduler.next_run['kuma'] == 120.0
+
+
+def test_recovery_counts_as_change_then_relaxes(scheduler, clock):
+    scheduler.record('kuma', 'outage', calm=False)
+    clock.now += 60
+
+    assert scheduler.has_changed('kuma', 'operational')
+    assert scheduler.record('kuma', 'operational', calm=True) == 60.0
+
+    clock.now += 60
+    assert not scheduler.has_changed('kuma', 'operational')
+    assert scheduler.record('kuma', 'operational', calm=True) == 120.0
+
+
+def test_first_result_is_not_a_change(scheduler):
+    assert not scheduler.has_changed('kuma', 'operational')
+
+
+def test_is_calm(scheduler):
+    assert scheduler.is_calm('operational', 'success')
+    assert not scheduler.is_calm('degraded', 'success')
+    assert not scheduler.is_calm('operational', 'unknown')
+
+
+@pytest.mark.parametrize('min_interval,max_interval,backoff', [
+    (0, 10, 2.0),
+    (20, 10, 2.0),
+    (10, 20, 0.5),
+])
+def test_invalid_poll_policy(min_interval, max_interval, backoff):
+    with pytest.raises(ValueError):
+        PollPolicy(min_interval, max_interval, backoff)
@@ -0,0 +1,43 @@
+"""
+Tests for status.py command-line parsing.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('boto3')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'cli'))
+
+from status import parse_args  # noqa: E402
+
+
+def test_defaults():
+    args = parse_args([])
+
+    assert not args.daemon
+    assert not args.upload
+    assert args.profile is None
+    assert args.profile_every == 1
+
+
+def test_daemon_with_upload_and_sampled_profiling():
+    args = parse_args(['--daemon', '--upload', '--profile', 'p.txt', '--profile-every', '50'])
+
+    assert args.daemon and args.upload
+    assert args.profile == 'p.txt'
+    assert args.profile_every == 50
+
+
+@pytest.mark.parametrize('argv', [
+    ['--upload'],
+    ['--profile-every', '10'],
+    ['--profile-every', '1'],
+    ['--profile', 'p.txt', '--profile-every', '0'],
+])
+def test_rejects_ignored_or_invalid_options(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
@@ -0,0 +1,117 @@
+"""
+Tests for UptimeCounters.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'cli'))
+
+from uptime_counters import BUCKET_SECONDS, UptimeCounters  # noqa: E402
+
+# Hour-aligned start time so bucket boundaries are easy to reason about
+T0 = 1000 * BUCKET_SECONDS
+HOUR = BUCKET_SECONDS
+
+
+def up(key='1'):
+    return {key: {'status': 1}}
+
+
+def down(key='1'):
+    return {key: {'status': 0}}
+
+
+def test_first_sample_counts_as_one_second():
+    counters = UptimeCounters()
+    counters.record(up(), now=T0)
+
+    assert counters.monitors['1']['buckets'] == {str(T0): [1.0, 1.0]}
+    assert counters.calculate_uptime('1', 24, now=T0) == 100.0
+
+
+def test_sample_weighted_by_elapsed_time():
+    counters = UptimeCounters()
+    counters.record(up(), now=T0)
+    counters.record(down(), now=T0 + 600)
+
+    # 1s up (first sample) + 600s down
+    assert counters.monitors['1']['buckets'][str(T0)] == [1.0, 601.0]
+    assert counters.calculate_uptime('1', 24, now=T0 + 600) == round(100 / 601, 2)
+
+
+def test_sample_weight_capped_by_max_sample_gap():
+    counters = UptimeCounters(max_sample_gap=300)
+    counters.record(up(), now=T0)
+    counters.record(down(), now=T0 + 3000)
+
+    assert counters.monitors['1']['buckets'][str(T0)] == [1.0, 301.0]
+
+
+def test_missing_status_is_skipped():
+    counters = UptimeCounters()
+    counters.record({'1': {'status': None}}, now=T0)
+
+    assert counters.monitors == {}
+    assert counters.calculate_uptime('1', 24, now=T0) is None
+
+
+def test_window_excludes_older_buckets():
+    counters = UptimeCounters()
+    counters.record(down(), now=T0)
+    counters.record(up(), now=T0 + 48 * HOUR)
+
+    now = T0 + 48 * HOUR
+    # Only the up sample's bucket is inside the last 24h
+    assert counters.calculate_uptime('1', 24, now=now) == 100.0
+    assert counters.calculate_uptime('1', 24 * 7, now=now) == round(3600 / 3601 * 100, 2)
+
+
+def test_30d_window_and_pruning_boundary():
+    counters = UptimeCounters()
+    counters.record(down(), now=T0)
+
+    # 719 hours later the first bucket is still the oldest hour of the 30d window
+    assert counters.calculate_uptime('1', 24 * 30, now=T0 + 719 * HOUR) == 0.0
+
+    # At 720 hours it falls out of the window
+    assert counters.calculate_uptime('1', 24 * 30, now=T0 + 720 * HOUR) is None
+
+    # ...and is pruned by the next sample after that
+    counters.record(up(), now=T0 + 720 * HOUR + 1)
+    assert str(T0) not in counters.monitors['1']['buckets']
+
+
+def test_aggregated_uptime_averages_monitors_with_data():
+    counters = UptimeCounters()
+    counters.record({'1': {'status': 1}, '2': {'status': 0}}, now=T0)
+
+    uptime = counters.get_aggregated_uptime(['1', '2', 'missing'], now=T0)
+
+    assert uptime == {'last_24h': 50.0, 'last_7d': 50.0, 'last_30d': 50.0}
+
+
+def test_aggregated_uptime_without_data_is_zero():
+    assert UptimeCounters().get_aggregated_uptime(['1'], now=T0) == {
+        'last_24h': 0.0,
+        'last_7d': 0.0,
+        'last_30d': 0.0
+    }
+
+
+def test_state_file_round_trip(tmp_path):
+    state_file = tmp_path / 'state' / 'uptime.json'
+    counters = UptimeCounters(str(state_file))
+    counters.record(up(), now=T0)
+    counters.save()
+
+    reloaded = UptimeCounters(str(state_file))
+
+    assert reloaded.monitors == counters.monitors
+
+
+def test_corrupt_state_file_starts_fresh(tmp_path):
+    state_file = tmp_path / 'uptime.json'
+    state_file.write_text('{not json')
+
+    assert UptimeCounters(str(state_file)).monitors == {}
@@ -0,0 +1,105 @@
+"""
+Tests for the /metrics parser and metrics-backend monitor filtering.
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('requests')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'cli'))
+
+from uptime_kuma_client import UptimeKumaClient, parse_metrics  # noqa: E402
+
+
+def test_parses_status_and_response_time_by_monitor_id():
+    samples = parse_metrics([
+        '# HELP monitor_status Monitor Status (1 = UP, 0= DOWN, 2= PENDING, 3= MAINTENANCE)',
+        '# TYPE monitor_status gauge',
+        'monitor_status{monitor_id="4",monitor_name="DB",monitor_type="port"} 0',
+        'monitor_response_time{monitor_id="4",monitor_name="DB",monitor_type="port"} 12.5',
+    ])
+
+    assert samples == {
+        '4': {'id': 4, 'name': 'DB', 'status': 0, 'response_time': 12.5}
+    }
+
+
+def test_name_only_series_keyed_by_name():
+    samples = parse_metrics(['monitor_status{monitor_name="Web",monitor_type="http"} 1'])
+
+    assert samples == {
+        'name:Web': {'id': None, 'name': 'Web', 'status': 1, 'response_time': None}
+    }
+
+
+def test_escaped_label_values():
+    samples = parse_metrics([
+        r'monitor_status{monitor_name="a \"quoted\" back\\slash\nline"} 1',
+    ])
+
+    assert list(samples.values())[0]['name'] == 'a "quoted" back\\slash\nline'
+
+
+def test_label_value_containing_brace():
+    samples = parse_metrics([
+        'monitor_status{monitor_name="api",monitor_url="https://x/{id}"} 2',
+    ])
+
+    assert samples['name:api']['status'] == 2
+
+
+def test_nan_status_and_response_time():
+    samples = parse_metrics([
+        'monitor_status{monitor_id="1",monitor_name="New"} NaN',
+        'monitor_response_time{monitor_id="1",monitor_name="New"} NaN',
+    ])
+
+    assert samples['1']['status'] is None
+    assert math.isnan(samples['1']['response_time'])
+
+
+def test_skips_other_series_and_bad_values():
+    samples = parse_metrics([
+        'process_cpu_seconds_total 1.2',
+        'monitor_cert_days_remaining{monitor_name="Web"} 30',
+        'monitor_status{monitor_name="Bad"} not-a-number',
+        'monitor_status{monitor_name="Web"} 1 1700000000000',
+    ])
+
+    assert list(samples) == ['name:Web']
+    assert samples['name:Web']['status'] == 1
+
+
+def make_metrics_client(lines, monitors):
+    client = UptimeKumaClient('https://kuma.example', 'key', backend='metrics')
+    client.get_metrics = lambda: parse_metrics(lines)
+    client.get_monitors = lambda: monitors
+    return client
+
+
+def test_monitor_ids_filter_by_name_without_monitor_id_labels():
+    client = make_metrics_client(
+        [
+            'monitor_status{monitor_name="Web"} 1',
+            'monitor_status{monitor_name="Internal test"} 0',
+        ],
+        [{'id': 1, 'name': 'Web'}, {'id': 2, 'name': 'Internal test'}]
+    )
+
+    status, _ = client.get_status_snapshot([1])
+
+    assert status == 'operational'
+
+
+def test_monitor_ids_fail_closed_when_names_cannot_be_resolved():
+    client = make_metrics_client(['monitor_status{monitor_name="Web"} 1'], [])
+
+    def unavailable():
+        raise OSError('api down')
+    client.get_monitors = unavailable
+
+    assert client.get_status_snapshot([1])[0] == 'unknown'